@@ -1,47 +1,75 @@
 #!/usr/bin/env python
 
 import argparse
-import json
-import glob
-from matplotlib import pyplot as plt
+import concurrent.futures
+try:
+    import orjson as fastjson
+except ImportError:
+    try:
+        import ujson as fastjson
+    except ImportError:
+        import json as fastjson
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+import matplotlib
+matplotlib.use('Agg')
 from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
 import numpy as np
 import os
+import sys
 
-def plot_survival_curve(times, name, total_solved, errors):
-    # Calculate survival curve
-    perf = np.array(np.sort(times))
-    cdf = np.cumsum(perf)
-    plt.plot(cdf, np.arange(0, len(cdf)), label=name, linestyle="solid", color="black")
-    plt.title(f"{name} - Solved {total_solved}, with {errors} errors")
-    plt.ylim(0)
-    plt.xlim(0.1)
-    plt.xscale("log")
-    plt.xlabel("Time Log Scale (ms)")
-    plt.ylabel("Instances Soveld")
-    plt.grid()
-    os.makedirs("fig/survival", exist_ok=True)
-    plt.savefig(f"fig/survival/{name}.pdf")
-    plt.close()
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "verita")
 
-class FunctionSmtTime:
-    def __init__(self, json):
-        self.name = json["function"]
-        self.time_ms = json["time"]
-        if "success" in json:
-            self.success = json["success"]
-        else:
-            print(f"Failed to find a success entry in {json}")
-            self.success = False
+def cache_path(filename):
+    st = os.stat(filename)
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    return os.path.join(CACHE_DIR, f"{stem}-{st.st_mtime_ns}-{st.st_size}.npz")
 
-    def __str__(self):
-        return f'{self.name} <{self.time_ms}>'
+try:
+    import numba
+
+    @numba.njit(cache=True, fastmath=True)
+    def survival_cdf(times):
+        # Fuse the sort and the running sum into one pass over one array
+        cdf = np.sort(times)
+        acc = 0.0
+        for i in range(cdf.size):
+            acc += cdf[i]
+            cdf[i] = acc
+        return cdf
+except ImportError:
+    def survival_cdf(times):
+        return np.cumsum(np.sort(times))
+
+def plot_survival_curve(times, name, total_solved, errors, ax=None):
+    # Figure setup dominates for small curves, so callers plotting many
+    # curves can pass in one axes to reuse instead of paying it per plot
+    if ax is None:
+        ax = Figure().subplots()
+    else:
+        ax.clear()
+    fig = ax.figure
+    # Calculate survival curve
+    cdf = survival_cdf(times)
+    ax.plot(cdf, np.arange(0, len(cdf)), label=name, linestyle="solid", color="black")
+    ax.set_title(f"{name} - Solved {total_solved}, with {errors} errors")
+    ax.set_ylim(0)
+    ax.set_xlim(0.1)
+    ax.set_xscale("log")
+    ax.set_xlabel("Time Log Scale (ms)")
+    ax.set_ylabel("Instances Soveld")
+    ax.grid()
+    os.makedirs("fig/survival", exist_ok=True)
+    fig.savefig(f"fig/survival/{name}.pdf")
 
 class Project:
     def __init__(self, json):
         self.name = json["runner"]["run_configuration"]["name"]
         self.refspec = json["runner"]["run_configuration"]["refspec"]
-        self.times_ms = json["times-ms"]
+        times_ms = json["times-ms"]
         if "verified" in json["verification-results"]:
             self.total_solved = json["verification-results"]["verified"]
         else:
@@ -53,36 +81,104 @@ class Project:
         self.run_label = json["runner"]["label"]
         self.date = json["runner"]["date"] if "date" in json["runner"] else json["runner"]["data"]
 
-        # Collect SMT times
-        self.fn_smt_times = []
-        if "smt" in self.times_ms:
-            for item in self.times_ms["smt"]["smt-run-module-times"]:
-                for function in item["function-breakdown"]:
-                    self.fn_smt_times.append(FunctionSmtTime(function))
+        # Collect SMT times as parallel arrays rather than one object per function;
+        # counting first lets us allocate each array exactly once
+        modules = times_ms["smt"]["smt-run-module-times"] if "smt" in times_ms else []
+        count = sum(len(item["function-breakdown"]) for item in modules)
+        self.fn_names = np.empty(count, dtype=object)
+        self.fn_times = np.empty(count, dtype=np.float64)
+        self.fn_success = np.empty(count, dtype=bool)
+        i = 0
+        for item in modules:
+            for function in item["function-breakdown"]:
+                # Names repeat across modules; interning dedups the strings
+                self.fn_names[i] = sys.intern(function["function"])
+                self.fn_times[i] = function["time"]
+                if "success" in function:
+                    self.fn_success[i] = function["success"]
+                else:
+                    print(f"Failed to find a success entry in {function}")
+                    self.fn_success[i] = False
+                i += 1
+        self.smt_times = self.fn_times[self.fn_success]
+
+        print(f"Total errors: {self.errors}; counted errors: {np.count_nonzero(~self.fn_success)}")
 
-        print(f"Total errors: {self.errors}; counted errors: {len([f for f in self.fn_smt_times if not f.success])}")
+    @classmethod
+    def from_cache(cls, path):
+        data = np.load(path, allow_pickle=True)
+        project = cls.__new__(cls)
+        for field in ["name", "refspec", "run_label", "date", "total_solved", "errors"]:
+            setattr(project, field, data[field].item())
+        project.fn_names = data["fn_names"]
+        project.fn_times = data["fn_times"]
+        project.fn_success = data["fn_success"]
+        project.smt_times = project.fn_times[project.fn_success]
+        return project
+
+    def save_cache(self, path):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        np.savez(path, name=self.name, refspec=self.refspec, run_label=self.run_label,
+                 date=self.date, total_solved=self.total_solved, errors=self.errors,
+                 fn_names=self.fn_names, fn_times=self.fn_times, fn_success=self.fn_success)
 
     def __str__(self):
         return f'{self.name} <{self.refspec}>'
 
     def get_smt_times(self):
-        return [f.time_ms for f in self.fn_smt_times if f.success]
+        return self.smt_times
+
+    def plot_survival_curve(self, ax=None):
+        plot_survival_curve(self.get_smt_times(), self.name, self.total_solved, self.errors, ax)
 
-    def plot_survival_curve(self):
-        plot_survival_curve(self.get_smt_times(), self.name, self.total_solved, self.errors)
 
+def _load_one(filename):
+    # Re-parsing the same results every invocation is wasteful; cache the
+    # extracted fields, keyed by the source file's mtime and size.
+    cached = cache_path(filename)
+    if os.path.exists(cached):
+        return Project.from_cache(cached)
+    with open(filename, 'rb') as file:
+        raw = file.read()
+    if filename.endswith('.msgpack'):
+        data = msgpack.unpackb(raw, raw=False)
+    else:
+        data = fastjson.loads(raw)
+    del raw
+    # Solver output can be megabytes per file (especially on failures) and
+    # nothing in this script reads it; drop it before construction so it is
+    # freed while the rest of the directory is still loading
+    if "runner" in data:
+        data["runner"].pop("stderr", None)
+        data["runner"].pop("stdout", None)
+    project = Project(data)
+    project.save_cache(cached)
+    return project
 
 def read_json_files_into_projects(directory):
-    projects = []
-    for filename in glob.glob(f'{directory}/*.json'):
-        with open(filename, 'r') as file:
-            projects.append(Project(json.load(file)))
-    return projects
+    # Prefer a msgpack sibling over the JSON when the runner emitted one,
+    # since unpacking it skips JSON parsing entirely
+    json_files = {}
+    packed_files = {}
+    for entry in os.scandir(directory):
+        if not entry.is_file(follow_symlinks=False):
+            continue
+        stem, ext = os.path.splitext(entry.name)
+        if ext == '.json':
+            json_files[stem] = entry.path
+        elif ext == '.msgpack' and msgpack is not None:
+            packed_files[stem] = entry.path
+    stems = sorted(json_files.keys() | packed_files.keys())
+    filenames = [packed_files.get(stem) or json_files[stem] for stem in stems]
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_load_one, filenames))
 
 class Run:
     def __init__(self, directory):
         self.directory = directory
         self.projects = read_json_files_into_projects(directory)
+        self._by_name = {project.name: project for project in self.projects}
         self.label = self.projects[0].run_label
         self.date = self.projects[0].date
 
@@ -90,7 +186,7 @@ class Run:
         self.errors = sum([project.errors for project in self.projects])
 
     def get_smt_times(self):
-        return [f.time_ms for project in self.projects for f in project.fn_smt_times if f.success]
+        return np.concatenate([project.smt_times for project in self.projects])
 
     def __str__(self):
         return f'{self.project} <{self.time_ms}>'
@@ -99,58 +195,55 @@ class Run:
         return [project.name for project in self.projects]
     
     def get_project(self, name):
-        for project in self.projects:
-            if project.name == name:
-                return project
-        return None
+        return self._by_name.get(name)
 
-    def plot_survival_curve(self):
-        plot_survival_curve(self.get_smt_times(), f'{self.label} ({self.date})', self.total_solved, self.errors)
+    def plot_survival_curve(self, ax=None):
+        plot_survival_curve(self.get_smt_times(), f'{self.label} ({self.date})', self.total_solved, self.errors, ax)
 
     def plot_survival_curves(self):
-        self.plot_survival_curve()
+        ax = Figure().subplots()
+        self.plot_survival_curve(ax)
         for project in self.projects:
-            project.plot_survival_curve()
+            project.plot_survival_curve(ax)
 
 def plot_runs_overall(pdf, name, runs):
-    plt.figure()
+    ax = Figure().subplots()
     for run in runs:
         # Calculate survival curve
         times = run.get_smt_times()
-        perf = np.array(np.sort(times))
-        cdf = np.cumsum(perf)
+        cdf = survival_cdf(times)
         label = f"{run.label} ({run.total_solved} verified; {run.errors} errors)"
-        plt.plot(cdf, np.arange(0, len(cdf)), label=label, linestyle="solid")
-    plt.legend()
-    plt.ylim(0)
-    plt.xlim(0.1)
-    plt.title(name)
-    plt.xscale("log")
-    plt.xlabel("Time Log Scale (ms)")
-    plt.ylabel("Functions Verified")
-    plt.grid()
-    pdf.savefig()
+        ax.plot(cdf, np.arange(0, len(cdf)), label=label, linestyle="solid")
+    ax.legend()
+    ax.set_ylim(0)
+    ax.set_xlim(0.1)
+    ax.set_title(name)
+    ax.set_xscale("log")
+    ax.set_xlabel("Time Log Scale (ms)")
+    ax.set_ylabel("Functions Verified")
+    ax.grid()
+    pdf.savefig(ax.figure)
 
 def plot_runs_per_project(pdf, runs):
+    ax = Figure().subplots()
     for project_name in sorted(runs[0].get_project_names()):
-        plt.figure()
+        ax.clear()
         for run in runs:
             # Calculate survival curve
             project = run.get_project(project_name)
             times = project.get_smt_times()
-            perf = np.array(np.sort(times))
-            cdf = np.cumsum(perf)
+            cdf = survival_cdf(times)
             label = f"{run.label} ({project.total_solved} verified; {project.errors} errors)"
-            plt.plot(cdf, np.arange(0, len(cdf)), label=label, linestyle="solid")
-        plt.legend()
-        plt.ylim(0)
-        plt.xlim(0.1)
-        plt.title(project_name)
-        plt.xscale("log")
-        plt.xlabel("Time Log Scale (ms)")
-        plt.ylabel("Functions Verified")
-        plt.grid()
-        pdf.savefig()
+            ax.plot(cdf, np.arange(0, len(cdf)), label=label, linestyle="solid")
+        ax.legend()
+        ax.set_ylim(0)
+        ax.set_xlim(0.1)
+        ax.set_title(project_name)
+        ax.set_xscale("log")
+        ax.set_xlabel("Time Log Scale (ms)")
+        ax.set_ylabel("Functions Verified")
+        ax.grid()
+        pdf.savefig(ax.figure)
 
 def main():
     parser = argparse.ArgumentParser()
@@ -1,18 +1,31 @@
 #!/usr/bin/env python
 
 import argparse
-import json
 import glob
+try:
+    import orjson as fastjson
+except ImportError:
+    try:
+        import ujson as fastjson
+    except ImportError:
+        import json as fastjson
+try:
+    import ijson
+except ImportError:
+    ijson = None
 from matplotlib import pyplot as plt
 from matplotlib.backends.backend_pdf import PdfPages
 import numpy as np
 import os
 
 def go(filename):
-    with open(filename, 'r') as file:
-        with open(filename, 'r') as file:
-            stderr = json.load(file)["runner"]["stderr"]
-            print(stderr)
+    with open(filename, 'rb') as file:
+        if ijson is not None:
+            # Stream straight to runner.stderr instead of parsing the whole file
+            stderr = next(ijson.items(file, 'runner.stderr'))
+        else:
+            stderr = fastjson.loads(file.read())["runner"]["stderr"]
+        print(stderr)
 
 def main():
     parser = argparse.ArgumentParser()